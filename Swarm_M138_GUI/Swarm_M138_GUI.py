@@ -15,10 +15,15 @@ import sys
 import os
 import os.path
 import platform
+import time
+import functools
+import operator
+import re
 
-from typing import Iterator, Tuple
+from pathlib import Path
+from typing import List, Set, Tuple
 
-from PyQt5.QtCore import QSettings, QProcess, QTimer, Qt, QIODevice, pyqtSignal, pyqtSlot, QObject
+from PyQt5.QtCore import QSettings, QProcess, QMetaObject, QThread, QTimer, Qt, QIODevice, pyqtSignal, pyqtSlot, QObject
 from PyQt5.QtWidgets import QWidget, QLabel, QComboBox, QGridLayout, QPushButton, \
     QApplication, QLineEdit, QFileDialog, QPlainTextEdit
 from PyQt5.QtGui import QCloseEvent, QTextCursor, QIcon, QFont
@@ -30,22 +35,24 @@ _APP_NAME = "Swarm M138 GUI"
 _RESOURCE_DIRECTORY = "resource"
 
 #https://stackoverflow.com/a/50914550
+_BASE_PATH = os.path.join(getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__))), _RESOURCE_DIRECTORY)
+
+@functools.lru_cache(maxsize=None)
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
-    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
-    return os.path.join(base_path, _RESOURCE_DIRECTORY, relative_path)
+    return os.path.join(_BASE_PATH, relative_path)
 
 def get_version(rel_path: str) -> str:
     try: 
-        with open(resource_path(rel_path), encoding='utf-8') as fp:
-            for line in fp.read().splitlines():
-                if line.startswith("__version__"):
-                    delim = '"' if '"' in line else "'"
-                    return line.split(delim)[1]
-            raise RuntimeError("Unable to find version string.")
-    except:
+        text = Path(resource_path(rel_path)).read_text(encoding='utf-8')
+    except OSError:
         raise RuntimeError("Unable to find _version.py.")
 
+    match = re.search(r'^__version__\s*=\s*[\'"]([^\'"]+)', text, re.MULTILINE)
+    if match is None:
+        raise RuntimeError("Unable to find version string.")
+    return match.group(1)
+
 _APP_VERSION = get_version("_version.py")
 
 # ----------------------------------------------------------------
@@ -64,53 +71,185 @@ class AUxComboBox(QComboBox):
 # ux_is_darkmode()
 #
 # Helpful function used during setup to determine if the Ux is in
-# dark mode
-_is_darkmode = None
+# dark mode. The result is cached after the first call
+@functools.lru_cache(maxsize=None)
 def ux_is_darkmode() -> bool:
-    global _is_darkmode
-
-    if _is_darkmode is not None:
-        return _is_darkmode
-
     osName = platform.system()
 
     if osName == "Darwin":
-        _is_darkmode = darkdetect.isDark()
+        return darkdetect.isDark()
 
     elif osName == "Windows":
         # it appears that the Qt interface on Windows doesn't apply DarkMode
         # So, just keep it light
-        _is_darkmode = False
+        return False
     elif osName == "Linux":
         # Need to check this on Linux at some pont
-        _is_darkmod = False
+        return False
 
     else:
-        _is_darkmode = False
-
-    return _is_darkmode
+        return False
+
+# Maximum number of lines kept in the terminal and message windows
+_MAX_LOG_LINES = 5000
+
+# How long (seconds) the list of available serial ports is cached for
+_PORT_CACHE_TIMEOUT = 2.0
+
+# Size (bytes) of the log file write buffer
+_LOG_FILE_BUFFER_SIZE = 65536
+
+# Pre-defined messages: (button label, message)
+_PREDEFINED_MESSAGES = [
+    ('Configuration Settings (CS)', 'CS'),
+    ('Date/Time Status (DT @)', 'DT @'),
+    ('Firmware Version (FV)', 'FV'),
+    ('GPS Jamming (GJ @)', 'GJ @'),
+    ('Geospatial Info (GN @)', 'GN @'),
+    ('GPS Fix Quality (GS @)', 'GS @'),
+    ('GPIO1 Read Pin (GP @)', 'GP @'),
+    ('GPIO1 Get Mode (GP ?)', 'GP ?'),
+    ('GPIO1 Set Mode - Analog (GP 1)', 'GP 1'),
+    ('GPIO1 Set Mode - Input (GP 2)', 'GP 2'),
+    ('GPIO1 Set Mode - Output Low (GP 5)', 'GP 5'),
+    ('GPIO1 Set Mode - Output High (GP 6)', 'GP 6'),
+    ('Messages Received - Count Unread (MM C=U)', 'MM C=U'),
+    ('Messages Received - Read Oldest (MM R=O)', 'MM R=O'),
+    ('Messages Received - Read Newest (MM R=N)', 'MM R=N'),
+    ('Messages Received - Notify Enable (MM N=E)', 'MM N=E'),
+    ('Messages Received - Notify Disable (MM N=D)', 'MM N=D'),
+    ('Message Transmit - Count Unsent (MT C=U)', 'MT C=U'),
+    ('Message Transmit - Delete All Unsent (MT D=U)', 'MT D=U'),
+    ('Power Off (PO)', 'PO'),
+    ('Power Status (PW @)', 'PW @'),
+    ('Restart Device (RS)', 'RS'),
+    ('Receive Test 1Hz (RT 1)', 'RT 1'),
+    ('Receive Test Stop (RT 0)', 'RT 0'),
+    ('Transmit Text - Hello World! (TD)', 'TD "Hello World!"'),
+    ('Transmit Binary - 00 01 02 03 04 05 (TD)', 'TD 000102030405'),
+]
 
 # Setting constants
 SETTING_PORT_NAME = 'port_name'
 SETTING_FILE_LOCATION = 'file_location'
 
-def gen_serial_ports() -> Iterator[Tuple[str, str, str]]:
+def gen_serial_ports() -> List[Tuple[str, str, str]]:
     """Return all available serial ports."""
     ports = QSerialPortInfo.availablePorts()
-    return ((p.description(), p.portName(), p.systemLocation()) for p in ports)
+    return [(p.description(), p.portName(), p.systemLocation()) for p in ports]
+
+def gen_serial_port_locations() -> Set[str]:
+    """Return the system locations of all available serial ports."""
+    return {p.systemLocation() for p in QSerialPortInfo.availablePorts()}
+
+def _append(widget: QPlainTextEdit, cursor: QTextCursor, text: str) -> None:
+    """Append text to the end of a log window using its cached cursor."""
+    cursor.movePosition(QTextCursor.End)
+    if not text.endswith('\n') and not widget.document().isEmpty():
+        # Start a new line, like appendPlainText. Serial data brings its own newline
+        text = '\n' + text
+    cursor.insertText(text)
+    scrollbar = widget.verticalScrollBar()
+    scrollbar.setValue(scrollbar.maximum())
+
+# ----------------------------------------------------------------
+# Writes the log file on its own thread so that a slow disk can not
+# stall the GUI. The file is opened by MainWidget and handed over.
+
+class LogWriter(QObject):
+
+    writeFailed = pyqtSignal(int)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.f = None
+        self.generation = 0 # Identifies the current file in writeFailed
+
+    @pyqtSlot(object, int)
+    def set_file(self, f, generation: int) -> None:
+        """Start writing to a newly opened file"""
+        self.close()
+        self.f = f
+        self.generation = generation
+
+    @pyqtSlot(str)
+    def write(self, text: str) -> None:
+        """Write text to the file"""
+        if self.f is None:
+            return
+        try:
+            self.f.write(text)
+        except IOError:
+            self._fail()
+
+    @pyqtSlot()
+    def flush(self) -> None:
+        """Flush the buffered file"""
+        if self.f is None:
+            return
+        try:
+            self.f.flush()
+        except IOError:
+            self._fail()
+
+    @pyqtSlot()
+    def close(self) -> None:
+        """Close the file"""
+        if self.f is None:
+            return
+        try:
+            self.f.close()
+        except IOError:
+            pass
+        self.f = None
+
+    def _fail(self) -> None:
+        self.close()
+        self.writeFailed.emit(self.generation)
 
 # noinspection PyArgumentList
 
 class MainWidget(QWidget):
     """Main Widget."""
 
+    logFileOpened = pyqtSignal(object, int)
+    logWrite = pyqtSignal(str)
+    logFlush = pyqtSignal()
+    logClose = pyqtSignal()
+
     def __init__(self, parent: QWidget = None) -> None:
         super().__init__(parent)
  
         self.fileOpen = False
 
-        self.timer=QTimer()
-        self.timer.timeout.connect(self.check_port_still_available)
+        self.ser = None
+
+        # Cache of the available serial ports: (timestamp, set of system locations)
+        self._ports_cache = (0.0, set())
+
+        # The ports currently listed in the combobox: (description, name, system location)
+        self._last_ports = []
+
+        # Received serial data which does not yet form a complete line
+        self._rx_buf = b''
+
+        # The log file is written by a LogWriter on its own thread.
+        # Each file opened is given a new generation number
+        self._log_generation = 0
+        self.log_thread = QThread()
+        self.log_writer = LogWriter()
+        self.log_writer.moveToThread(self.log_thread)
+        self.logFileOpened.connect(self.log_writer.set_file, Qt.QueuedConnection)
+        self.logWrite.connect(self.log_writer.write, Qt.QueuedConnection)
+        self.logFlush.connect(self.log_writer.flush, Qt.QueuedConnection)
+        self.logClose.connect(self.log_writer.close, Qt.QueuedConnection)
+        self.log_writer.writeFailed.connect(self.on_log_write_failed)
+        self.log_thread.start()
+        QApplication.instance().aboutToQuit.connect(self.stop_log_writer)
+
+        # The log file is buffered. Flush it once per second
+        self.flush_timer=QTimer()
+        self.flush_timer.timeout.connect(self.flush_log_file)
 
         # File location line edit
         self.msg_label = QLabel(self.tr('Log File:'))
@@ -182,58 +321,11 @@ class MainWidget(QWidget):
         Messages_header = QLabel(self.tr('Pre-defined Messages:'))
         Messages_header.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
 
-        self.cs_btn = QPushButton(self.tr('Configuration Settings (CS)'))
-        self.cs_btn.clicked.connect(lambda: self.on_message_btn_pressed('CS'))
-        self.dt_btn = QPushButton(self.tr('Date/Time Status (DT @)'))
-        self.dt_btn.clicked.connect(lambda: self.on_message_btn_pressed('DT @'))
-        self.fv_btn = QPushButton(self.tr('Firmware Version (FV)'))
-        self.fv_btn.clicked.connect(lambda: self.on_message_btn_pressed('FV'))
-        self.gj_btn = QPushButton(self.tr('GPS Jamming (GJ @)'))
-        self.gj_btn.clicked.connect(lambda: self.on_message_btn_pressed('GJ @'))
-        self.gn_btn = QPushButton(self.tr('Geospatial Info (GN @)'))
-        self.gn_btn.clicked.connect(lambda: self.on_message_btn_pressed('GN @'))
-        self.gs_btn = QPushButton(self.tr('GPS Fix Quality (GS @)'))
-        self.gs_btn.clicked.connect(lambda: self.on_message_btn_pressed('GS @'))
-        self.gp_read_btn = QPushButton(self.tr('GPIO1 Read Pin (GP @)'))
-        self.gp_read_btn.clicked.connect(lambda: self.on_message_btn_pressed('GP @'))
-        self.gp_mode_btn = QPushButton(self.tr('GPIO1 Get Mode (GP ?)'))
-        self.gp_mode_btn.clicked.connect(lambda: self.on_message_btn_pressed('GP ?'))
-        self.gp_mode1_btn = QPushButton(self.tr('GPIO1 Set Mode - Analog (GP 1)'))
-        self.gp_mode1_btn.clicked.connect(lambda: self.on_message_btn_pressed('GP 1'))
-        self.gp_mode2_btn = QPushButton(self.tr('GPIO1 Set Mode - Input (GP 2)'))
-        self.gp_mode2_btn.clicked.connect(lambda: self.on_message_btn_pressed('GP 2'))
-        self.gp_mode5_btn = QPushButton(self.tr('GPIO1 Set Mode - Output Low (GP 5)'))
-        self.gp_mode5_btn.clicked.connect(lambda: self.on_message_btn_pressed('GP 5'))
-        self.gp_mode6_btn = QPushButton(self.tr('GPIO1 Set Mode - Output High (GP 6)'))
-        self.gp_mode6_btn.clicked.connect(lambda: self.on_message_btn_pressed('GP 6'))
-        self.mm_count_btn = QPushButton(self.tr('Messages Received - Count Unread (MM C=U)'))
-        self.mm_count_btn.clicked.connect(lambda: self.on_message_btn_pressed('MM C=U'))
-        self.mm_old_btn = QPushButton(self.tr('Messages Received - Read Oldest (MM R=O)'))
-        self.mm_old_btn.clicked.connect(lambda: self.on_message_btn_pressed('MM R=O'))
-        self.mm_new_btn = QPushButton(self.tr('Messages Received - Read Newest (MM R=N)'))
-        self.mm_new_btn.clicked.connect(lambda: self.on_message_btn_pressed('MM R=N'))
-        self.mm_notify_on_btn = QPushButton(self.tr('Messages Received - Notify Enable (MM N=E)'))
-        self.mm_notify_on_btn.clicked.connect(lambda: self.on_message_btn_pressed('MM N=E'))
-        self.mm_notify_off_btn = QPushButton(self.tr('Messages Received - Notify Disable (MM N=D)'))
-        self.mm_notify_off_btn.clicked.connect(lambda: self.on_message_btn_pressed('MM N=D'))
-        self.mt_count_btn = QPushButton(self.tr('Message Transmit - Count Unsent (MT C=U)'))
-        self.mt_count_btn.clicked.connect(lambda: self.on_message_btn_pressed('MT C=U'))
-        self.mt_delete_btn = QPushButton(self.tr('Message Transmit - Delete All Unsent (MT D=U)'))
-        self.mt_delete_btn.clicked.connect(lambda: self.on_message_btn_pressed('MT D=U'))
-        self.po_btn = QPushButton(self.tr('Power Off (PO)'))
-        self.po_btn.clicked.connect(lambda: self.on_message_btn_pressed('PO'))
-        self.pw_btn = QPushButton(self.tr('Power Status (PW @)'))
-        self.pw_btn.clicked.connect(lambda: self.on_message_btn_pressed('PW @'))
-        self.rs_btn = QPushButton(self.tr('Restart Device (RS)'))
-        self.rs_btn.clicked.connect(lambda: self.on_message_btn_pressed('RS'))
-        self.rt_on_btn = QPushButton(self.tr('Receive Test 1Hz (RT 1)'))
-        self.rt_on_btn.clicked.connect(lambda: self.on_message_btn_pressed('RT 1'))
-        self.rt_off_btn = QPushButton(self.tr('Receive Test Stop (RT 0)'))
-        self.rt_off_btn.clicked.connect(lambda: self.on_message_btn_pressed('RT 0'))
-        self.td_btn = QPushButton(self.tr('Transmit Text - Hello World! (TD)'))
-        self.td_btn.clicked.connect(lambda: self.on_message_btn_pressed('TD \"Hello World!\"'))
-        self.td_bin_btn = QPushButton(self.tr('Transmit Binary - 00 01 02 03 04 05 (TD)'))
-        self.td_bin_btn.clicked.connect(lambda: self.on_message_btn_pressed('TD 000102030405'))
+        self.message_btns = []
+        for label, message in _PREDEFINED_MESSAGES:
+            btn = QPushButton(self.tr(label))
+            btn.clicked.connect(functools.partial(self.on_message_btn_pressed, message))
+            self.message_btns.append(btn)
 
         # Arrange Layout
         
@@ -261,32 +353,8 @@ class MainWidget(QWidget):
 
         layout.addWidget(Messages_header, 0, 4)
 
-        layout.addWidget(self.cs_btn, 1, 4)
-        layout.addWidget(self.dt_btn, 2, 4)
-        layout.addWidget(self.fv_btn, 3, 4)
-        layout.addWidget(self.gj_btn, 4, 4)
-        layout.addWidget(self.gn_btn, 5, 4)
-        layout.addWidget(self.gs_btn, 6, 4)
-        layout.addWidget(self.gp_read_btn, 7, 4)
-        layout.addWidget(self.gp_mode_btn, 8, 4)
-        layout.addWidget(self.gp_mode1_btn, 9, 4)
-        layout.addWidget(self.gp_mode2_btn, 10, 4)
-        layout.addWidget(self.gp_mode5_btn, 11, 4)
-        layout.addWidget(self.gp_mode6_btn, 12, 4)
-        layout.addWidget(self.mm_count_btn, 13, 4)
-        layout.addWidget(self.mm_old_btn, 14, 4)
-        layout.addWidget(self.mm_new_btn, 15, 4)
-        layout.addWidget(self.mm_notify_on_btn, 16, 4)
-        layout.addWidget(self.mm_notify_off_btn, 17, 4)
-        layout.addWidget(self.mt_count_btn, 18, 4)
-        layout.addWidget(self.mt_delete_btn, 19, 4)
-        layout.addWidget(self.po_btn, 20, 4)
-        layout.addWidget(self.pw_btn, 21, 4)
-        layout.addWidget(self.rs_btn, 22, 4)
-        layout.addWidget(self.rt_on_btn, 23, 4)
-        layout.addWidget(self.rt_off_btn, 24, 4)
-        layout.addWidget(self.td_btn, 25, 4)
-        layout.addWidget(self.td_bin_btn, 26, 4)
+        for row, btn in enumerate(self.message_btns, start=1):
+            layout.addWidget(btn, row, 4)
 
         self.setLayout(layout)
 
@@ -300,6 +368,16 @@ class MainWidget(QWidget):
         self.terminal.setReadOnly(True)
         self.messages.setReadOnly(True)
 
+        # Limit the size of the log windows. The oldest lines are discarded
+        self.terminal.setMaximumBlockCount(_MAX_LOG_LINES)
+        self.messages.setMaximumBlockCount(_MAX_LOG_LINES)
+
+        # Cache the cursors used to append to the log windows
+        self._term_cursor = self.terminal.textCursor()
+        self._term_cursor.movePosition(QTextCursor.End)
+        self._msg_cursor = self.messages.textCursor()
+        self._msg_cursor.movePosition(QTextCursor.End)
+
     def load_settings(self) -> None:
         """Load Qsettings on startup."""
         
@@ -338,12 +416,7 @@ class MainWidget(QWidget):
     def on_message_btn_pressed(self, message: str) -> None:
         """Paste the appropriate message and send it"""
 
-        self.config.clear() # Clear the config window
-        self.config.moveCursor(QTextCursor.End)
-        self.config.ensureCursorVisible()
-        self.config.appendPlainText(message)
-        self.config.ensureCursorVisible()
-        self.config.repaint()
+        self.config.setPlainText(message) # Replace the contents of the config window
         
         self.on_send_message_btn_pressed()
 
@@ -353,7 +426,6 @@ class MainWidget(QWidget):
         self.messages.clear() # Clear the message window
         self.messages.moveCursor(QTextCursor.End)
         self.messages.ensureCursorVisible()
-        self.messages.repaint()
 
     def on_clear_terminal_btn_pressed(self) -> None:
         """Clear the terminal"""
@@ -361,98 +433,52 @@ class MainWidget(QWidget):
         self.terminal.clear() # Clear the serial terminal window
         self.terminal.moveCursor(QTextCursor.End)
         self.terminal.ensureCursorVisible()
-        self.terminal.repaint()
 
     def chksum_nmea(self, sentence):
         """Calculate the NMEA checksum"""
-        # Initializing our first XOR value
-        csum = 0 
-        # For each char in chksumdata, XOR against the previous XOR'd char.
-        # The final XOR of the last char will be our  checksum
-        for c in sentence:
-            csum ^= ord(c)
-        return csum
+        # XOR all of the bytes in the sentence together
+        if isinstance(sentence, str):
+            sentence = sentence.encode('utf-8')
+        return functools.reduce(operator.xor, sentence, 0)
 
     def on_send_message_btn_pressed(self) -> None:
         """Send the message to the modem"""
 
-        portAvailable = False
-        for desc, name, sys in gen_serial_ports():
-            try:
-                if (sys == self.port):
-                    portAvailable = True
-            except:
-                pass
+        portAvailable = self.port in self._port_set()
 
         if (portAvailable == False):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Error: Port No Longer Available!")
-            self.messages.ensureCursorVisible()
-            try:
+            _append(self.messages, self._msg_cursor, "Error: Port No Longer Available!")
+            if self.ser is not None:
                 self.ser.close()
-            except:
-                pass
-            self.endTimer()
             return
         
-        try:
-            if self.ser.isOpen():
-                portAvailable = True
-            else:
-                portAvailable = False
-        except:
-            portAvailable = False
+        portAvailable = (self.ser is not None) and self.ser.isOpen()
 
         if (portAvailable == False):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Error: Port Is Not Open!")
-            self.messages.ensureCursorVisible()
-            try:
+            _append(self.messages, self._msg_cursor, "Error: Port Is Not Open!")
+            if self.ser is not None:
                 self.ser.close()
-            except:
-                pass
-            self.endTimer()
             return
 
-        if (self.config.toPlainText() == ''):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Warning: Nothing To Do! Message Is Empty!")
-            self.messages.ensureCursorVisible()
+        body = self.config.toPlainText()
+
+        if (body == ''):
+            _append(self.messages, self._msg_cursor, "Warning: Nothing To Do! Message Is Empty!")
             return
 
-        self.ser.write(bytes('$','utf-8')) # Send the $
-        self.ser.write(bytes(self.config.toPlainText(),'utf-8')) # Send the config message
-        self.ser.write(bytes('*','utf-8')) # Send the *
-        self.ser.write(str.format('{:02X}', self.chksum_nmea(self.config.toPlainText())).encode('utf-8'))
-        self.ser.write(bytes('\n','utf-8'))
+        data = body.encode('utf-8')
+        checksum = str.format('{:02X}', self.chksum_nmea(data))
 
-        msg = "$"
-        msg += self.config.toPlainText()
-        msg += "*"
-        msg += str.format('{:02X}', self.chksum_nmea(self.config.toPlainText())).encode('utf-8').decode('utf-8')
-        msg += "\n"
+        # Send the $, config message, *, checksum and newline in a single write
+        payload = b'$' + data + b'*' + checksum.encode('ascii') + b'\n'
+        self.ser.write(payload)
 
-        self.terminal.moveCursor(QTextCursor.End)
-        self.terminal.ensureCursorVisible()        
-        self.terminal.appendPlainText(msg)
-        self.terminal.ensureCursorVisible()
+        msg = payload.decode('utf-8')
+
+        _append(self.terminal, self._term_cursor, msg)
 
         if self.fileOpen == True:
-            try:
-                self.f.write(msg);
-            except IOError:
-                self.fileOpen = False
-                self.messages.moveCursor(QTextCursor.End)
-                self.messages.ensureCursorVisible()
-                self.messages.appendPlainText("Error: Could Not Write To File!")
-                self.messages.ensureCursorVisible()
-                try:
-                    self.f.close();
-                except:
-                    pass
+            self.logWrite.emit(msg)
 
     # --------------------------------------------------------------
     # on_port_combobox()
@@ -465,16 +491,35 @@ class MainWidget(QWidget):
     def on_port_combobox(self):
         self.update_com_ports()
 
+    def _port_set(self) -> Set[str]:
+        """Return the system locations of the available serial ports."""
+        # Enumerating the ports is slow, so cache the result for a short time
+        now = time.monotonic()
+        timestamp, ports = self._ports_cache
+        if now - timestamp < _PORT_CACHE_TIMEOUT:
+            return ports
+        ports = gen_serial_port_locations()
+        self._ports_cache = (now, ports)
+        return ports
+
     def update_com_ports(self) -> None:
         """Update COM Port list in GUI."""
 
+        ports = gen_serial_ports()
+        self._ports_cache = (time.monotonic(), {sys for desc, name, sys in ports})
+
+        if ports == self._last_ports: # Nothing has changed so keep the existing list
+            return
+        self._last_ports = ports
+
         previousPort = self.port # Record the previous port before we clear the combobox
         
+        self.port_combobox.blockSignals(True)
         self.port_combobox.clear()
 
         index = 0
         indexOfPrevious = -1
-        for desc, name, sys in gen_serial_ports():
+        for desc, name, sys in ports:
             longname = desc + " (" + name + ")"
             self.port_combobox.addItem(longname, sys)
             if(sys == previousPort): # Previous port still exists so record it
@@ -483,6 +528,7 @@ class MainWidget(QWidget):
 
         if indexOfPrevious > -1: # Restore the previous port if it still exists
             self.port_combobox.setCurrentIndex(indexOfPrevious)
+        self.port_combobox.blockSignals(False)
 
     @property
     def port(self) -> str:
@@ -501,259 +547,163 @@ class MainWidget(QWidget):
         except:
             pass
 
-        try:
+        if self.ser is not None:
             self.ser.close()
-        except:
-            pass
         
-        try:
-            self.f.close()
-        except:
-            pass
-
-        self.endTimer()
+        self.stop_log_writer()
         
         event.accept()
 
+    @pyqtSlot()
+    def stop_log_writer(self) -> None:
+        """Let the writer finish any queued writes and close the file, then stop its thread"""
+
+        self.flush_timer.stop()
+        if self.log_thread.isRunning():
+            QMetaObject.invokeMethod(self.log_writer, 'close', Qt.BlockingQueuedConnection)
+            self.log_thread.quit()
+            self.log_thread.wait()
+
     def on_open_port_btn_pressed(self) -> None:
         """Check if port is available and open it"""
 
-        portAvailable = False
-        for desc, name, sys in gen_serial_ports():
-            try:
-                if (sys == self.port):
-                    portAvailable = True
-            except:
-                pass
+        portAvailable = self.port in self._port_set()
 
         if (portAvailable == False):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Error: Port No Longer Available!")
-            self.messages.ensureCursorVisible()
-            try:
+            _append(self.messages, self._msg_cursor, "Error: Port No Longer Available!")
+            if self.ser is not None:
                 self.ser.close()
-            except:
-                pass
-            self.endTimer()
             return
 
-        try:
-            if self.ser.isOpen():
-                portAvailable = True
-            else:
-                portAvailable = False
-        except:
-            portAvailable = False
+        portAvailable = (self.ser is not None) and self.ser.isOpen()
 
         if (portAvailable == True):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Port Is Already Open!")
-            self.messages.ensureCursorVisible()
+            _append(self.messages, self._msg_cursor, "Port Is Already Open!")
             return
         
-        try:
-            self.ser = QSerialPort()
-            self.ser.setPortName(self.port)
-            self.ser.setBaudRate(QSerialPort.Baud115200)
-            self.ser.open(QIODevice.ReadWrite)
-        except:
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Error: Could Not Open The Port!")
-            self.messages.ensureCursorVisible()
-            try:
-                self.ser.close()
-            except:
-                pass
-            self.endTimer()
+        self.ser = QSerialPort()
+        self.ser.setPortName(self.port)
+        self.ser.setBaudRate(QSerialPort.Baud115200)
+        if not self.ser.open(QIODevice.ReadWrite):
+            _append(self.messages, self._msg_cursor, "Error: Could Not Open The Port!")
             return
 
-        self.startTimer()
-
+        self._rx_buf = b''
+        self.ser.errorOccurred.connect(self._on_ser_error) # Detect the port being unplugged
         self.ser.readyRead.connect(self.receive) # Connect the receiver
         
         self.messages.clear() # Clear the message window
         self.terminal.clear() # Clear the serial terminal window
         
-        self.messages.moveCursor(QTextCursor.End)
-        self.messages.ensureCursorVisible()
-        self.messages.appendPlainText("Port is now open")
-        self.messages.ensureCursorVisible()
+        _append(self.messages, self._msg_cursor, "Port is now open")
 
     @pyqtSlot()
     def receive(self) -> None:
-        try:
-            while self.ser.canReadLine():
-                text = self.ser.readLine().data().decode()
-                self.terminal.moveCursor(QTextCursor.End)
-                self.terminal.ensureCursorVisible()
-                self.terminal.insertPlainText(text)
-                self.terminal.ensureCursorVisible()
-                self.terminal.repaint()
-
-                if self.fileOpen == True:
-                    try:
-                        self.f.write(text);
-                    except IOError:
-                        self.fileOpen = False
-                        self.messages.moveCursor(QTextCursor.End)
-                        self.messages.ensureCursorVisible()
-                        self.messages.appendPlainText("Error: Could Not Write To File!")
-                        self.messages.ensureCursorVisible()
-                        self.messages.repaint()
-                        try:
-                            self.f.close();
-                        except:
-                            pass
-        except:
-            pass
+        if self.ser is None:
+            return
 
-    def startTimer(self) -> None:
-        self.timer.start(1000)
+        # Read everything which is waiting. Keep any partial line until the rest arrives
+        self._rx_buf += bytes(self.ser.readAll())
+        end = self._rx_buf.rfind(b'\n') + 1
 
-    def endTimer(self) -> None:
-        self.timer.stop()
+        if end == 0:
+            return
 
-    def check_port_still_available(self) -> None:
-        """Check if port is still available"""
+        # Add the complete lines to the terminal and log file in one go
+        text = self._rx_buf[:end].decode('utf-8', 'replace')
+        self._rx_buf = self._rx_buf[end:]
+        _append(self.terminal, self._term_cursor, text)
 
-        portAvailable = False
-        for desc, name, sys in gen_serial_ports():
-            try:
-                if (sys == self.port):
-                    portAvailable = True
-            except:
-                pass
+        if self.fileOpen == True:
+            self.logWrite.emit(text)
 
-        if (portAvailable == False):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Error: Port No Longer Available!")
-            self.messages.ensureCursorVisible()
-            self.messages.repaint()
-            try:
+    def _on_ser_error(self, error: QSerialPort.SerialPortError) -> None:
+        """Close the port if it is no longer available"""
+
+        if (error == QSerialPort.ResourceError):
+            _append(self.messages, self._msg_cursor, "Error: Port No Longer Available!")
+            if self.ser is not None:
                 self.ser.close()
-            except:
-                pass
-            self.endTimer()
 
     def on_close_port_btn_pressed(self) -> None:
         """Close the port"""
 
-        portAvailable = False
-        for desc, name, sys in gen_serial_ports():
-            try:
-                if (sys == self.port):
-                    portAvailable = True
-            except:
-                pass
+        portAvailable = self.port in self._port_set()
 
         if (portAvailable == False):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Error: Port No Longer Available!")
-            self.messages.ensureCursorVisible()
-            self.messages.repaint()
-            try:
+            _append(self.messages, self._msg_cursor, "Error: Port No Longer Available!")
+            if self.ser is not None:
                 self.ser.close()
-            except:
-                pass
-            self.endTimer()
             return
 
-        try:
-            if self.ser.isOpen():
-                portAvailable = True
-            else:
-                portAvailable = False
-        except:
-            portAvailable = False
+        portAvailable = (self.ser is not None) and self.ser.isOpen()
 
         if (portAvailable == False):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Port Is Already Closed!")
-            self.messages.ensureCursorVisible()
-            self.messages.repaint()
-            try:
+            _append(self.messages, self._msg_cursor, "Port Is Already Closed!")
+            if self.ser is not None:
                 self.ser.close()
-            except:
-                pass
-            self.endTimer()
             return
 
-        try:
-            self.ser.close()
-        except:
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Error: Could Not Close The Port!")
-            self.messages.ensureCursorVisible()
-            self.messages.repaint()
+        self.ser.close()
+
+        _append(self.messages, self._msg_cursor, "Port is now closed")
+
+    def flush_log_file(self) -> None:
+        """Flush the buffered log file"""
+
+        if self.fileOpen == True:
+            self.logFlush.emit()
+
+    @pyqtSlot(int)
+    def on_log_write_failed(self, generation: int) -> None:
+        """The log writer could not write to the file and has closed it"""
+
+        # Ignore failures from a file which has already been closed
+        if (self.fileOpen == False) or (generation != self._log_generation):
             return
 
-        self.messages.moveCursor(QTextCursor.End)
-        self.messages.ensureCursorVisible()
-        self.messages.appendPlainText("Port is now closed")
-        self.messages.ensureCursorVisible()
-        self.messages.repaint()
+        self.logClose.emit()
+        self.fileOpen = False
+        self.flush_timer.stop()
+
+        _append(self.messages, self._msg_cursor, "Error: Could Not Write To File!")
 
     def on_start_logging_btn_pressed(self) -> None:
         """Start logging everything to file"""
 
         if (self.fileOpen == True):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("File Is Already Open!")
-            self.messages.ensureCursorVisible()
-            self.messages.repaint()
+            _append(self.messages, self._msg_cursor, "File Is Already Open!")
             return
 
         try:
-            self.f = open(self.fileLocation_lineedit.text(),"a")
+            f = open(self.fileLocation_lineedit.text(), "a", encoding='utf-8', buffering=_LOG_FILE_BUFFER_SIZE)
             self.fileOpen = True
         except IOError:
             self.fileOpen = False
 
         if (self.fileOpen == False):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("Error: Could Not Open File!")
-            self.messages.ensureCursorVisible()
-            self.messages.repaint()
+            _append(self.messages, self._msg_cursor, "Error: Could Not Open File!")
             return
 
-        self.messages.moveCursor(QTextCursor.End)
-        self.messages.ensureCursorVisible()
-        self.messages.appendPlainText("File open")
-        self.messages.ensureCursorVisible()
-        self.messages.repaint()
+        self._log_generation += 1
+        self.logFileOpened.emit(f, self._log_generation)
+        self.flush_timer.start(1000)
+
+        _append(self.messages, self._msg_cursor, "File open")
 
     def on_stop_logging_btn_pressed(self) -> None:
         """Close the log file"""
 
         if (self.fileOpen == False):
-            self.messages.moveCursor(QTextCursor.End)
-            self.messages.ensureCursorVisible()
-            self.messages.appendPlainText("File Is Already Closed!")
-            self.messages.ensureCursorVisible()
-            self.messages.repaint()
+            _append(self.messages, self._msg_cursor, "File Is Already Closed!")
             return
 
-        try:
-            self.f.close()
-        except IOError:
-            pass
+        self.logClose.emit()
 
         self.fileOpen = False
+        self.flush_timer.stop()
 
-        self.messages.moveCursor(QTextCursor.End)
-        self.messages.ensureCursorVisible()
-        self.messages.appendPlainText("File closed")
-        self.messages.ensureCursorVisible()
-        self.messages.repaint()
+        _append(self.messages, self._msg_cursor, "File closed")
 
 def startGUI():
     """Start the GUI"""